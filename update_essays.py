@@ -3,27 +3,46 @@
 individual essay pages under /essays/ for LLM discoverability."""
 
 import xml.etree.ElementTree as ET
+import argparse
+import urllib.error
 import urllib.request
 import re
 import html
 import json
+import logging
 import os
+import shutil
+import sys
+import tempfile
 import time
-from urllib.parse import unquote
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote_to_bytes
 from email.utils import parsedate_to_datetime
-from datetime import timezone
+from datetime import datetime, timezone
+
+log = logging.getLogger("update_essays")
 
 FEED_URL = "https://extramediumplease.substack.com/feed"
 ESSAYS_FILE = "essays.html"
 ESSAYS_DIR = "essays"
 SITEMAP_FILE = "sitemap.xml"
+OG_CACHE_FILE = ".og_image_cache.json"
+FEED_CACHE_FILE = ".feed_cache.json"
 SITE_URL = "https://afolkestad.com"
+USER_AGENT = "Mozilla/5.0"
+HTTP_TIMEOUT = 15
+HTTP_ATTEMPTS = 3
+RETRY_STATUSES = (429, 503)  # rate limited / temporarily unavailable
+MAX_RETRY_AFTER = 60  # seconds; cap on a server-requested Retry-After
+READ_CHUNK = 16384
 
 # Marker comments in essays.html
 SELECTED_START = "<!-- SELECTED_START -->"
 SELECTED_END = "<!-- SELECTED_END -->"
 ALL_START = "<!-- ESSAYS_START -->"
 ALL_END = "<!-- ESSAYS_END -->"
+_MARKER_RE = re.compile(r"<!-- (?:SELECTED|ESSAYS)_(?:START|END) -->")
 
 # Selected essays in display order (URL slugs)
 SELECTED_SLUGS = [
@@ -36,36 +55,232 @@ SELECTED_SLUGS = [
 SUBSTACK_CDN = "https://substackcdn.com/image/fetch/w_320,h_213,c_fill,f_auto,q_auto:good,fl_progressive:steep,g_center/"
 NS = {"content": "http://purl.org/rss/1.0/modules/content/"}
 
+# OG image fetching: parallel workers sharing one global request rate
+OG_FETCH_WORKERS = 8
+OG_FETCH_RATE = 3  # requests per second, across all workers
+
+# Patterns used once per post; compiled up front
+# A tag, allowing '>' inside quoted attribute values. Quotes only delimit a
+# value right after '='; a stray one (alt=it's, an unterminated value) makes
+# the first branch fail and the tag ends at the first '>' instead.
+_TAG_RE = re.compile(r"""<(?:[^'">]|=\s*"[^"]*"|=\s*'[^']*')+>|<[^>]+>""")
+_SLUG_RE = re.compile(r"/p/([^/?]+)")
+_DIV_TAG_RE = re.compile(r"<div|</div>")
+# Post page <meta> tags are matched on the raw bytes; only captures get decoded
+_OG_IMAGE_RE = re.compile(rb'<meta[^>]+property="og:image"[^>]+content="([^"]+)"')
+_OG_TITLE_RE = re.compile(rb'<meta[^>]+property="og:title"[^>]+content="([^"]+)"')
+_OG_DESC_RE = re.compile(rb'<meta[^>]+property="og:description"[^>]+content="([^"]+)"')
+_PUBLISHED_RE = re.compile(rb'<meta[^>]+property="article:published_time"[^>]+content="([^"]+)"')
+_S3_IMAGE_RE = re.compile(
+    rb"(https://substack-post-media\.s3\.amazonaws\.com/public/images/[^\s\"&]+)"
+)
 
-def fetch_feed():
-    req = urllib.request.Request(FEED_URL, headers={"User-Agent": "Mozilla/5.0"})
-    with urllib.request.urlopen(req) as resp:
-        return resp.read().decode("utf-8")
 
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
 
-def fetch_og_image(url):
+def _read_until(resp, marker):
+    """Read `resp` in chunks until `marker` has been seen or the body ends."""
+    buf = bytearray()
+    while True:
+        chunk = resp.read(READ_CHUNK)
+        if not chunk:
+            break
+        seen = len(buf)
+        buf += chunk
+        if marker in buf[max(0, seen - len(marker) + 1):]:
+            break
+    return bytes(buf)
+
+
+def _get_once(url, headers, until):
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=HTTP_TIMEOUT) as resp:
+            body = resp.read() if until is None else _read_until(resp, until)
+            return resp.status, resp.headers, body
+    except urllib.error.HTTPError as e:
+        # urlopen reports 304 Not Modified as an error; it's a normal answer
+        # to a conditional request
+        if e.code == 304:
+            return e.code, e.headers, b""
+        raise
+
+
+def _retry_delay(err, attempt):
+    """Seconds to wait before retrying after `err`: the server's Retry-After
+    (delta-seconds or HTTP date) if present, else exponential backoff."""
+    value = err.headers.get("Retry-After") if err.headers else None
+    if value:
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), MAX_RETRY_AFTER)
+    return 2 ** attempt
+
+
+def http_get(url, headers=None, until=None, throttle=None):
+    """GET `url`, following redirects. Returns (status, headers, body bytes).
+    With `until`, stop reading the body once that byte string has arrived
+    and close the connection. `throttle`, if given, is called before every
+    attempt (retries included), e.g. a shared rate limiter's acquire.
+    429/503 responses are retried after Retry-After or exponential backoff;
+    other 4xx/5xx (and a final 429/503) raise urllib.error.HTTPError, as
+    urlopen would."""
+    headers = {"User-Agent": USER_AGENT, **(headers or {})}
+    for attempt in range(HTTP_ATTEMPTS):
+        if throttle is not None:
+            throttle()
+        try:
+            return _get_once(url, headers, until)
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRY_STATUSES or attempt == HTTP_ATTEMPTS - 1:
+                raise
+            time.sleep(_retry_delay(e, attempt))
+
+
+def fetch_feed(cache):
+    """Fetch the RSS feed, revalidating against `cache` (the last response's
+    ETag / Last-Modified and body). A 304 reuses the cached body; a fresh
+    body is stored back into `cache`."""
+    headers = {}
+    if cache.get("body"):
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+    status, resp_headers, body = http_get(FEED_URL, headers=headers)
+    if status == 304:
+        log.info("  Feed not modified, using cached copy")
+        return cache["body"]
+    text = body.decode("utf-8")
+    cache.clear()
+    cache.update({
+        "etag": resp_headers.get("ETag"),
+        "last_modified": resp_headers.get("Last-Modified"),
+        "body": text,
+    })
+    return text
+
+
+def parse_og_meta(page):
+    """Extract (og:title, og:description, thumbnail URL) from the raw bytes
+    of a post page. The thumbnail is the CDN-resized og:image; anything
+    not found comes back as ""."""
+    title_m = _OG_TITLE_RE.search(page)
+    desc_m = _OG_DESC_RE.search(page)
+    image_m = _OG_IMAGE_RE.search(page)
+    title = html.unescape(title_m.group(1).decode("utf-8", errors="replace")) if title_m else ""
+    desc = html.unescape(desc_m.group(1).decode("utf-8", errors="replace")) if desc_m else ""
+    image = ""
+    if image_m:
+        s3_match = _S3_IMAGE_RE.search(unquote_to_bytes(image_m.group(1)))
+        if s3_match:
+            image = SUBSTACK_CDN + s3_match.group(1).decode("utf-8", errors="replace")
+    return title, desc, image
+
+
+def fetch_og_image(url, throttle=None):
     """Fetch the og:image from a post's page, return CDN-resized thumbnail URL."""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            page = resp.read().decode("utf-8", errors="replace")
-        m = re.search(r'<meta[^>]+property="og:image"[^>]+content="([^"]+)"', page)
-        if m:
-            raw_url = unquote(m.group(1))
-            s3_match = re.search(
-                r"(https://substack-post-media\.s3\.amazonaws\.com/public/images/[^\s\"&]+)",
-                raw_url,
-            )
-            if s3_match:
-                return SUBSTACK_CDN + s3_match.group(1)
-            return ""
+        # The meta tags are in <head>; don't download the whole article
+        _, _, head = http_get(url, until=b"</head>", throttle=throttle)
+        return parse_og_meta(head)[2]
     except Exception as e:
-        print(f"  Warning: could not fetch OG image from {url}: {e}")
+        log.warning(f"  Warning: could not fetch OG image from {url}: {e}")
     return ""
 
 
+class _RateLimiter:
+    """Token bucket shared between threads: at most `rate` acquisitions per
+    second on average, with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._burst, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            # Take a token even if it goes negative; later callers wait longer.
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+def load_json_cache(path):
+    """Load a JSON dict cached from a previous run ({} if missing or corrupt)."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_json_cache(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def fetch_og_images(posts, cache):
+    """Fill in the "image" field of every post that lacks one and whose page
+    hasn't been searched already. `cache` maps post URL -> image URL; hits
+    skip the fetch, and newly found images are added to it."""
+    missing = []
+    for p in posts:
+        if p["image"] or p["image_checked"]:
+            continue
+        if p["link"] in cache:
+            p["image"] = cache[p["link"]]
+        else:
+            missing.append(p)
+    limiter = _RateLimiter(OG_FETCH_RATE)
+
+    def fetch(p):
+        log.info(f"  - {p['title']}")
+        # Retries go through the limiter too, so rate-limited workers
+        # don't all come back at once
+        p["image"] = fetch_og_image(p["link"], throttle=limiter.acquire)
+
+    with ThreadPoolExecutor(max_workers=OG_FETCH_WORKERS) as ex:
+        list(ex.map(fetch, missing))
+
+    # Failed lookups stay uncached so the next run retries them
+    for p in missing:
+        if p["image"]:
+            cache[p["link"]] = p["image"]
+
+
+def strip_tags(text):
+    """Remove HTML tags from `text`.
+
+    >>> strip_tags('<a title="x>y">t</a>')
+    't'
+    >>> strip_tags("<img alt=it's>x")
+    'x'
+    >>> strip_tags("<img alt=it's>x, don't <b>y</b> z")
+    "x, don't y z"
+    >>> strip_tags('<a title="unterminated>t</a>')
+    't'
+    """
+    return _TAG_RE.sub("", text)
+
+
 def get_slug(link):
-    m = re.search(r"/p/([^/?]+)", link)
+    m = _SLUG_RE.search(link)
     return m.group(1) if m else None
 
 
@@ -81,8 +296,7 @@ def parse_posts(xml_text):
         content_html = content_el.text if content_el is not None and content_el.text else ""
 
         # Clean up description
-        desc = re.sub(r"<[^>]+>", "", desc).strip()
-        desc = html.unescape(desc)
+        desc = html.unescape(strip_tags(desc).strip()) if desc else ""
 
         # Parse date
         date_str = ""
@@ -103,6 +317,7 @@ def parse_posts(xml_text):
             "date": date_str,
             "date_iso": date_iso,
             "image": "",
+            "image_checked": False,
             "content_html": content_html,
         })
     return posts
@@ -116,15 +331,14 @@ def _extract_balanced_div(text, start):
     """From position `start` (pointing at '<div'), find the matching </div>.
     Returns the end position (after '</div>') or -1."""
     depth = 0
-    i = start
-    while i < len(text):
-        if text[i:i + 4] == "<div":
+    # Jump between div tags instead of stepping through every character
+    for m in _DIV_TAG_RE.finditer(text, start):
+        if m.group() == "<div":
             depth += 1
-        elif text[i:i + 6] == "</div>":
+        else:
             depth -= 1
             if depth == 0:
-                return i + 6
-        i += 1
+                return m.end()
     return -1
 
 
@@ -247,7 +461,7 @@ def _simplify_post_embed(block):
         thumb = f"https://substackcdn.com/image/fetch/w_300,c_limit,f_auto,q_auto:good,fl_progressive:steep/{cover}"
         img_html = f'<img src="{thumb}" alt="" loading="lazy">'
     # If it's one of our own essays, link locally
-    slug_m = re.search(r"/p/([^/?]+)", url)
+    slug_m = _SLUG_RE.search(url)
     slug = slug_m.group(1) if slug_m else ""
     if "extramediumplease.substack.com" in url and slug:
         href = f"{slug}.html"
@@ -412,7 +626,7 @@ def generate_essay_page(post):
 
     # If the cleaned content is very short, it's likely a video/audio post
     # where Substack omitted the main media from the feed. Add a link.
-    stripped_len = len(re.sub(r"<[^>]+>", "", clean_content))
+    stripped_len = len(strip_tags(clean_content))
     if stripped_len < 500:
         clean_content += (
             f'\n<a href="{html.escape(post["link"])}" target="_blank" rel="noopener" '
@@ -472,7 +686,7 @@ def write_essay_pages(posts):
         with open(filepath, "w") as f:
             f.write(page_html)
         written.append(p)
-        print(f"  wrote {filepath}")
+        log.info(f"  wrote {filepath}")
 
     # Write machine-readable index
     index = {
@@ -493,7 +707,7 @@ def write_essay_pages(posts):
     index_path = os.path.join(ESSAYS_DIR, "index.json")
     with open(index_path, "w") as f:
         json.dump(index, f, indent=2, ensure_ascii=False)
-    print(f"  wrote {index_path} ({len(written)} essays)")
+    log.info(f"  wrote {index_path} ({len(written)} essays)")
 
     return written
 
@@ -503,53 +717,59 @@ def write_essay_pages(posts):
 # ---------------------------------------------------------------------------
 
 def generate_card_html(posts, local_links=True):
-    cards = []
-    for p in posts:
-        img_html = ""
-        if p["image"]:
-            img_html = (
-                f'<img src="{p["image"]}" alt="{html.escape(p["title"])}"'
-                f' width="320" height="213" loading="lazy">'
-            )
-
-        date_html = f'<span class="essay-date">{p["date"]}</span>' if p["date"] else ""
+    """Render the essay cards for one section of essays.html.
+    Fragments are appended to one list and joined once at the end."""
+    out = []
+    append = out.append
+    for i, p in enumerate(posts):
+        if i:
+            append("\n")
 
         if local_links and p["slug"]:
-            href = f"essays/{p['slug']}.html"
-            target = ""
-            rel = ""
+            append(f'            <a href="essays/{html.escape(p["slug"])}.html" class="essay-card">\n')
         else:
-            href = p["link"]
-            target = ' target="_blank"'
-            rel = ' rel="noopener"'
-
-        cards.append(
-            f'            <a href="{href}"{target}{rel} class="essay-card">\n'
-            f"                {img_html}\n"
-            f'                <div class="essay-card-text">\n'
-            f"                    <h3>{html.escape(p['title'])}</h3>\n"
-            f"                    <p>{html.escape(p['description'])}</p>\n"
-            f"                    {date_html}\n"
-            f"                </div>\n"
-            f"            </a>"
-        )
-
-    return "\n".join(cards)
-
+            append(
+                f'            <a href="{html.escape(p["link"])}" target="_blank"'
+                f' rel="noopener" class="essay-card">\n'
+            )
 
-def replace_between_markers(content, start_marker, end_marker, new_html):
-    start = content.find(start_marker)
-    end = content.find(end_marker)
-    if start == -1 or end == -1:
-        print(f"ERROR: Could not find markers {start_marker} / {end_marker}")
+        append("                ")
+        if p["image"]:
+            append(
+                f'<img src="{html.escape(p["image"])}" alt="{html.escape(p["title"])}"'
+                f' width="320" height="213" loading="lazy">'
+            )
+        append("\n")
+
+        append('                <div class="essay-card-text">\n')
+        append(f"                    <h3>{html.escape(p['title'])}</h3>\n")
+        append(f"                    <p>{html.escape(p['description'])}</p>\n")
+        append("                    ")
+        if p["date"]:
+            append(f'<span class="essay-date">{html.escape(p["date"])}</span>')
+        append("\n")
+        append("                </div>\n")
+        append("            </a>")
+
+    return "".join(out)
+
+
+def find_markers(content):
+    """Locate all four marker comments in a single scan. Returns
+    {marker: offset of its first occurrence}, or None if any is missing
+    or the SELECTED block doesn't precede the ESSAYS block."""
+    found = {}
+    for m in _MARKER_RE.finditer(content):
+        found.setdefault(m.group(0), m.start())
+    missing = [mk for mk in (SELECTED_START, SELECTED_END, ALL_START, ALL_END) if mk not in found]
+    if missing:
+        log.error(f"ERROR: Could not find markers {' / '.join(missing)}")
         return None
-    return (
-        content[: start + len(start_marker)]
-        + "\n"
-        + new_html
-        + "\n            "
-        + content[end:]
-    )
+    offsets = [found[SELECTED_START], found[SELECTED_END], found[ALL_START], found[ALL_END]]
+    if offsets != sorted(offsets):
+        log.error(f"ERROR: Markers out of order, expected {SELECTED_START} ... {ALL_END}")
+        return None
+    return found
 
 
 def update_essays_html(selected_posts, all_posts, has_local_pages):
@@ -557,19 +777,44 @@ def update_essays_html(selected_posts, all_posts, has_local_pages):
     with open(ESSAYS_FILE, "r") as f:
         content = f.read()
 
-    selected_html = generate_card_html(selected_posts, local_links=has_local_pages)
-    all_html = generate_card_html(all_posts, local_links=has_local_pages)
-
-    content = replace_between_markers(content, SELECTED_START, SELECTED_END, selected_html)
-    if content is None:
+    marks = find_markers(content)
+    if marks is None:
         return False
 
-    content = replace_between_markers(content, ALL_START, ALL_END, all_html)
-    if content is None:
-        return False
+    selected_html = generate_card_html(selected_posts, local_links=has_local_pages)
+    all_html = generate_card_html(all_posts, local_links=has_local_pages)
 
-    with open(ESSAYS_FILE, "w") as f:
-        f.write(content)
+    # Join all pieces at once rather than chaining '+', which would copy
+    # the growing page at every step
+    new_content = "".join([
+        content[: marks[SELECTED_START] + len(SELECTED_START)],
+        "\n", selected_html, "\n            ",
+        content[marks[SELECTED_END] : marks[ALL_START] + len(ALL_START)],
+        "\n", all_html, "\n            ",
+        content[marks[ALL_END] :],
+    ])
+
+    # Leave the file (and its mtime) alone when nothing changed, so a no-op
+    # run doesn't trigger a site rebuild
+    if new_content == content:
+        log.info(f"  {ESSAYS_FILE} unchanged")
+        return True
+
+    # Write to a temporary file next to essays.html and rename it over the
+    # original, so a crash never leaves a half-written essays.html behind.
+    # The temp file is created 0600, so copy over the original's mode.
+    tmp = tempfile.NamedTemporaryFile(
+        "w", dir=os.path.dirname(os.path.abspath(ESSAYS_FILE)),
+        prefix=f".{os.path.basename(ESSAYS_FILE)}.", suffix=".tmp", delete=False,
+    )
+    try:
+        with tmp:
+            tmp.write(new_content)
+        shutil.copymode(ESSAYS_FILE, tmp.name)
+        os.replace(tmp.name, ESSAYS_FILE)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
     return True
 
 
@@ -602,7 +847,7 @@ def update_sitemap(essay_posts):
 
     with open(SITEMAP_FILE, "w") as f:
         f.write("\n".join(lines))
-    print(f"Updated {SITEMAP_FILE} ({len(urls)} URLs)")
+    log.info(f"Updated {SITEMAP_FILE} ({len(urls)} URLs)")
 
 
 # ---------------------------------------------------------------------------
@@ -610,40 +855,44 @@ def update_sitemap(essay_posts):
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
-    print("Fetching Substack RSS feed...")
-    xml_text = fetch_feed()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--refresh", action="store_true",
+        help=f"ignore {OG_CACHE_FILE} and {FEED_CACHE_FILE}; re-fetch everything",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s", stream=sys.stdout)
+
+    log.info("Fetching Substack RSS feed...")
+    feed_cache = {} if args.refresh else load_json_cache(FEED_CACHE_FILE)
+    xml_text = fetch_feed(feed_cache)
 
-    print("Parsing posts...")
+    log.info("Parsing posts...")
     posts = parse_posts(xml_text)
-    print(f"Found {len(posts)} posts")
+    # Only cache a body that parsed; otherwise later 304s would keep
+    # replaying it
+    save_json_cache(FEED_CACHE_FILE, feed_cache)
+    log.info(f"Found {len(posts)} posts")
 
     # Check for selected essays not in feed
     feed_slugs = {p["slug"] for p in posts if p["slug"]}
     for slug in SELECTED_SLUGS:
         if slug not in feed_slugs:
-            print(f"  Selected essay '{slug}' not in feed, fetching page...")
+            log.info(f"  Selected essay '{slug}' not in feed, fetching page...")
             url = f"https://extramediumplease.substack.com/p/{slug}"
             try:
-                req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-                with urllib.request.urlopen(req, timeout=15) as resp:
-                    page = resp.read().decode("utf-8", errors="replace")
-                title_m = re.search(
-                    r'<meta[^>]+property="og:title"[^>]+content="([^"]+)"', page
-                )
-                desc_m = re.search(
-                    r'<meta[^>]+property="og:description"[^>]+content="([^"]+)"', page
-                )
-                date_m = re.search(
-                    r'<meta[^>]+property="article:published_time"[^>]+content="([^"]+)"', page
-                )
-                title = html.unescape(title_m.group(1)) if title_m else slug
-                desc = html.unescape(desc_m.group(1)) if desc_m else ""
+                _, _, body = http_get(url)
+                page = body.decode("utf-8", errors="replace")
+                # og:image comes from this same page, saving a second request
+                # for it in fetch_og_images()
+                title, desc, image = parse_og_meta(body)
+                title = title or slug
+                date_m = _PUBLISHED_RE.search(body)
                 date_str = ""
                 date_iso = ""
                 if date_m:
                     try:
-                        from datetime import datetime
-                        dt = datetime.fromisoformat(date_m.group(1).replace("Z", "+00:00"))
+                        dt = datetime.fromisoformat(date_m.group(1).decode("ascii").replace("Z", "+00:00"))
                         date_str = dt.strftime("%b %d, %Y")
                         date_iso = dt.strftime("%Y-%m-%dT%H:%M:%SZ")
                     except Exception:
@@ -668,22 +917,22 @@ if __name__ == "__main__":
                     "description": desc,
                     "date": date_str,
                     "date_iso": date_iso,
-                    "image": "",
+                    "image": image,
+                    # Page already searched for og:image; don't fetch it again
+                    "image_checked": True,
                     "content_html": content_html,
                 })
                 if content_html:
-                    print(f"    got {len(content_html)} chars of content")
+                    log.info(f"    got {len(content_html)} chars of content")
                 else:
-                    print(f"    warning: no content extracted")
+                    log.warning("    warning: no content extracted")
             except Exception as e:
-                print(f"  Warning: could not fetch {url}: {e}")
+                log.warning(f"  Warning: could not fetch {url}: {e}")
 
-    print("Fetching OG images from each post...")
-    for p in posts:
-        if not p["image"]:
-            print(f"  - {p['title']}")
-            p["image"] = fetch_og_image(p["link"])
-            time.sleep(0.3)
+    log.info("Fetching OG images from each post...")
+    og_cache = {} if args.refresh else load_json_cache(OG_CACHE_FILE)
+    fetch_og_images(posts, og_cache)
+    save_json_cache(OG_CACHE_FILE, og_cache)
 
     # Build lookup by slug
     by_slug = {}
@@ -692,22 +941,22 @@ if __name__ == "__main__":
             by_slug[p["slug"]] = p
 
     # Generate individual essay pages
-    print("Generating essay pages...")
+    log.info("Generating essay pages...")
     written = write_essay_pages(posts)
 
     # Selected essays in specified order
     selected = [by_slug[s] for s in SELECTED_SLUGS if s in by_slug]
 
     # Update index page (link locally if we generated pages)
-    print(f"Updating {ESSAYS_FILE}...")
+    log.info(f"Updating {ESSAYS_FILE}...")
     has_local = len(written) > 0
     if update_essays_html(selected, posts, has_local):
-        print("  Done!")
+        log.info("  Done!")
     else:
-        print("  Failed to update. Check the markers in essays.html.")
+        log.error("  Failed to update. Check the markers in essays.html.")
 
     # Update sitemap
-    print("Updating sitemap...")
+    log.info("Updating sitemap...")
     update_sitemap(posts)
 
-    print(f"\nFinished: {len(written)} essay pages written, index updated, sitemap updated.")
+    log.info(f"\nFinished: {len(written)} essay pages written, index updated, sitemap updated.")